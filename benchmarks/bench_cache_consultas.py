@@ -0,0 +1,100 @@
+# RAG_Dengue/benchmarks/bench_cache_consultas.py
+"""
+Taxa de acerto (total: LRU de embeddings + resultados pré-computados) e latência da recuperação com o cache de consultas:
+sem cache, LRU frio, LRU aquecido pelo FAQ e FAQ com resultados pré-computados.
+
+Não chama a API: o embedding e a busca são simulados com atrasos fixos
+(ida e volta de rede e busca no Chroma). O tráfego mistura variações das
+perguntas do FAQ (mais frequentes) com perguntas únicas. Execute a partir da raiz:
+
+    python -m benchmarks.bench_cache_consultas
+"""
+import time
+import random
+import statistics
+
+from memorias.cache_consultas import CacheConsultas, carrega_faq
+
+FAQ_PATH = "files/faq.txt"
+N_CONSULTAS = 300
+FRACAO_FAQ = 0.7
+ATRASO_EMBEDDING_S = 0.08
+ATRASO_BUSCA_S = 0.01
+
+
+def _embedding_falso(texto: str) -> list:
+    time.sleep(ATRASO_EMBEDDING_S)
+    return [float(len(texto))]
+
+
+def _busca_falsa(vetor: list) -> list:
+    time.sleep(ATRASO_BUSCA_S)
+    return ["doc"]
+
+
+def _variacao(pergunta: str, rng: random.Random) -> str:
+    # Diferenças que a normalização absorve: caixa, acentos e pontuação final.
+    opcoes = [pergunta, pergunta.lower(), pergunta.upper(), pergunta.rstrip("?"), f"  {pergunta}  "]
+    return rng.choice(opcoes)
+
+
+def _trafego(faq, seed: int = 7):
+    rng = random.Random(seed)
+    pesos = [1 / (i + 1) for i in range(len(faq))]  # Zipf: poucas perguntas dominam
+    consultas = []
+    for i in range(N_CONSULTAS):
+        if rng.random() < FRACAO_FAQ:
+            consultas.append(_variacao(rng.choices(faq, weights=pesos)[0], rng))
+        else:
+            consultas.append(f"pergunta única número {i} sobre dengue")
+    return consultas
+
+
+def _recupera(cache, pergunta: str):
+    if cache is None:
+        return _busca_falsa(_embedding_falso(pergunta))
+    docs = cache.resultado(pergunta)
+    if docs is None:
+        docs = _busca_falsa(cache.embedding(pergunta, _embedding_falso))
+    return docs
+
+
+def _cenario(nome: str, faq, consultas):
+    cache = None
+    if nome != "sem cache":
+        cache = CacheConsultas(capacidade=512)
+        if nome == "LRU + FAQ":
+            cache.aquece(faq, _embedding_falso)
+        elif nome == "LRU + FAQ + resultados":
+            cache.aquece(faq, _embedding_falso, _busca_falsa)
+
+    latencias = []
+    for pergunta in consultas:
+        ini = time.perf_counter()
+        _recupera(cache, pergunta)
+        latencias.append((time.perf_counter() - ini) * 1000)
+    latencias.sort()
+    p99 = latencias[min(len(latencias) - 1, int(0.99 * len(latencias)))]
+
+    stats = cache.estatisticas() if cache else {"taxa_hit_total": 0.0, "hits_resultado": 0}
+    return (
+        stats["taxa_hit_total"],
+        stats["hits_resultado"] / len(consultas),
+        statistics.mean(latencias),
+        statistics.median(latencias),
+        p99,
+    )
+
+
+def main():
+    faq = carrega_faq(FAQ_PATH)
+    consultas = _trafego(faq)
+    print(f"{len(consultas)} consultas | {len(faq)} perguntas no FAQ | {FRACAO_FAQ:.0%} do tráfego do FAQ")
+    print(f"{'cenário':<24}{'hit tot.':>9}{'hit res.':>9}{'média ms':>10}{'p50 ms':>8}{'p99 ms':>8}")
+    for nome in ("sem cache", "LRU frio", "LRU + FAQ", "LRU + FAQ + resultados"):
+        hit_total, hit_res, media, p50, p99 = _cenario(nome, faq, consultas)
+        print(f"{nome:<24}{hit_total:>9.1%}{hit_res:>9.1%}{media:>10.1f}{p50:>8.1f}{p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
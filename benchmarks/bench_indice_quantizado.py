@@ -0,0 +1,167 @@
+# RAG_Dengue/benchmarks/bench_indice_quantizado.py
+"""
+Compara o índice quantizado (float16/int8, com e sem re-rank) com o baseline float32.
+
+Todos os cenários usam MMR (k=12, fetch_k=36), como o retriever de produção, e o
+recall@k é medido contra o MMR exato em float32. Cada cenário roda num processo
+separado e reporta a memória real do processo (RSS) acima da linha de base após
+montar o índice e após as consultas (inclui as páginas lidas do arquivo de
+originais mapeado em memória).
+
+Usa vetores sintéticos com a dimensão do text-embedding-004 (768), então não
+precisa de GOOGLE_API_KEY nem do db_dengue. Execute a partir da raiz:
+
+    python -m benchmarks.bench_indice_quantizado
+"""
+import gc
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+import numpy as np
+from langchain_core.documents import Document
+
+from indices.indice_quantizado import IndiceQuantizado
+
+N_VETORES = 20_000
+N_CONSULTAS = 200
+DIM = 768
+K = 12
+FETCH_K = 36
+
+
+def _rss_mb() -> dict:
+    """
+    RSS atual do processo em MB (Linux), separado em memória anônima (do processo)
+    e páginas de arquivo (ex.: originais mapeados, recuperáveis pelo sistema).
+    Em outros sistemas, apenas o pico total via resource.
+    """
+    campos = {"VmRSS": "total", "RssAnon": "anon", "RssFile": "arquivo"}
+    rss = {}
+    try:
+        with open("/proc/self/status") as f:
+            for linha in f:
+                chave = linha.split(":")[0]
+                if chave in campos:
+                    rss[campos[chave]] = int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    if not rss:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        rss = {"total": pico, "anon": pico, "arquivo": 0.0}
+    return rss
+
+
+def _delta(depois: dict, antes: dict) -> dict:
+    return {chave: depois[chave] - antes[chave] for chave in antes}
+
+
+def _dados(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    # Agrupamentos simulam chunks parecidos do mesmo PDF.
+    centros = rng.normal(size=(64, DIM)).astype(np.float32)
+    grupos = rng.integers(0, len(centros), size=N_VETORES)
+    vetores = centros[grupos] + 0.6 * rng.normal(size=(N_VETORES, DIM)).astype(np.float32)
+    consultas = centros[rng.integers(0, len(centros), size=N_CONSULTAS)]
+    consultas = consultas + 0.6 * rng.normal(size=consultas.shape).astype(np.float32)
+    return vetores, consultas
+
+
+class _ColecaoFalsa:
+    """Imita `Chroma.get`: carrega tudo do disco para a memória, como na montagem real."""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+
+    def get(self, include=None):
+        vetores = np.load(self.caminho)
+        n = len(vetores)
+        return {
+            "ids": [str(i) for i in range(n)],
+            "embeddings": vetores,
+            "documents": [str(i) for i in range(n)],
+            "metadatas": [None] * n,
+        }
+
+
+def _executa_cenario(diretorio: str, modo: str, rerank: int) -> dict:
+    rss_inicial = _rss_mb()
+    indice = IndiceQuantizado.de_chroma(
+        _ColecaoFalsa(os.path.join(diretorio, "vetores.npy")),
+        modo=modo,
+        rerank=rerank,
+        caminho_originais=os.path.join(diretorio, f"originais_{modo}_{rerank}.npy"),
+    )
+    gc.collect()
+    rss_indice = _delta(_rss_mb(), rss_inicial)
+
+    consultas = np.load(os.path.join(diretorio, "consultas.npy"))
+    latencias, resultados = [], []
+    for consulta in consultas:
+        ini = time.perf_counter()
+        resultados.append(indice.busca_posicoes(consulta, k=K, fetch_k=FETCH_K))
+        latencias.append(time.perf_counter() - ini)
+    lat = np.asarray(latencias) * 1000
+    return {
+        "bytes_por_vetor": indice.bytes_por_vetor,
+        "rss_indice": rss_indice,
+        "rss_final": _delta(_rss_mb(), rss_inicial),
+        "p50": float(np.median(lat)),
+        "p99": float(np.percentile(lat, 99)),
+        "resultados": resultados,
+    }
+
+
+def _cenario_em_processo(diretorio: str, modo: str, rerank: int) -> dict:
+    saida = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_indice_quantizado", "--cenario", diretorio, modo, str(rerank)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(saida.stdout)
+
+
+def main():
+    vetores, consultas = _dados()
+    cenarios = [
+        ("float32", 1),
+        ("float16", 1),
+        ("float16", 4),
+        ("int8", 1),
+        ("int8", 4),
+    ]
+    with tempfile.TemporaryDirectory() as diretorio:
+        np.save(os.path.join(diretorio, "vetores.npy"), vetores)
+        np.save(os.path.join(diretorio, "consultas.npy"), consultas)
+
+        baseline = IndiceQuantizado(vetores, [Document(page_content="")] * N_VETORES, modo="float32")
+        referencia = [set(baseline.busca_posicoes(c, k=K, fetch_k=FETCH_K)) for c in consultas]
+        del baseline
+
+        print(f"{N_VETORES} vetores x {DIM} dims | {N_CONSULTAS} consultas | MMR k={K} fetch_k={FETCH_K}")
+        print("recall@k vs MMR exato em float32; RSS em MB acima da linha de base do processo,")
+        print("após montar o índice e após as consultas (anônima / páginas de arquivo mapeado)")
+        print(
+            f"{'modo':<10}{'rerank':>7}{'bytes/vetor':>13}{'RSS índice':>12}{'RSS final':>15}"
+            f"{'p50 ms':>9}{'p99 ms':>9}{'recall':>9}"
+        )
+        for modo, rerank in cenarios:
+            r = _cenario_em_processo(diretorio, modo, rerank)
+            acertos = sum(len(set(obtido) & esperado) for obtido, esperado in zip(r["resultados"], referencia))
+            recall = acertos / (K * len(consultas))
+            final = f"{r['rss_final']['anon']:.1f} / {r['rss_final']['arquivo']:.1f}"
+            print(
+                f"{modo:<10}{rerank:>7}{r['bytes_por_vetor']:>13}{r['rss_indice']['anon']:>12.1f}"
+                f"{final:>15}{r['p50']:>9.2f}{r['p99']:>9.2f}{recall:>9.3f}"
+            )
+    print("float16 economiza memória, mas a conversão por consulta o deixa mais lento que float32.")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--cenario":
+        print(json.dumps(_executa_cenario(sys.argv[2], sys.argv[3], int(sys.argv[4]))))
+    else:
+        main()
@@ -0,0 +1,63 @@
+# RAG_Dengue/benchmarks/bench_prazo.py
+"""
+Latência de cauda (p50/p99) da etapa de geração com um modelo falso lento,
+sem orçamento, com orçamento (fallback extrativo) e com orçamento + hedge.
+
+Não chama o Gemini: o "modelo" dorme por uma latência de cauda longa
+(a maioria rápida, ~5% muito lentas). Execute a partir da raiz:
+
+    python -m benchmarks.bench_prazo
+"""
+import time
+import random
+import asyncio
+import statistics
+
+from chains.prazo import executa_etapa, novo_prazo
+
+N_REQUISICOES = 400
+ORCAMENTO_S = 1.0
+TIMEOUT_GERACAO_S = 0.8
+HEDGE_ATRASO_S = 0.3
+# Os tempos são reduzidos para o benchmark rodar rápido; a proporção é o que importa.
+
+
+async def _modelo_lento(rng: random.Random) -> str:
+    atraso = rng.uniform(2.0, 6.0) if rng.random() < 0.05 else rng.uniform(0.1, 0.25)
+    await asyncio.sleep(atraso)
+    return "resposta do modelo"
+
+
+async def _uma(rng: random.Random, modo: str):
+    ini = time.perf_counter()
+    degradada = False
+    if modo == "sem orçamento":
+        await _modelo_lento(rng)
+    else:
+        hedge = HEDGE_ATRASO_S if modo == "orçamento + hedge" else None
+        try:
+            await executa_etapa(lambda: _modelo_lento(rng), TIMEOUT_GERACAO_S, novo_prazo(ORCAMENTO_S), hedge)
+        except asyncio.TimeoutError:
+            degradada = True  # aqui o RAG montaria a resposta extrativa
+    return time.perf_counter() - ini, degradada
+
+
+async def _cenario(modo: str):
+    rng = random.Random(42)
+    resultados = await asyncio.gather(*(_uma(rng, modo) for _ in range(N_REQUISICOES)))
+    lat = sorted(r[0] * 1000 for r in resultados)
+    p99 = lat[min(len(lat) - 1, int(0.99 * len(lat)))]
+    degradadas = sum(1 for r in resultados if r[1])
+    return statistics.median(lat), p99, lat[-1], degradadas
+
+
+def main():
+    print(f"{N_REQUISICOES} requisições | orçamento {ORCAMENTO_S}s | geração {TIMEOUT_GERACAO_S}s")
+    print(f"{'modo':<20}{'p50 ms':>9}{'p99 ms':>9}{'máx ms':>9}{'degradadas':>12}")
+    for modo in ("sem orçamento", "orçamento", "orçamento + hedge"):
+        p50, p99, maximo, degradadas = asyncio.run(_cenario(modo))
+        print(f"{modo:<20}{p50:>9.0f}{p99:>9.0f}{maximo:>9.0f}{degradadas:>12}")
+
+
+if __name__ == "__main__":
+    main()
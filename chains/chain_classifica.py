@@ -1,8 +1,11 @@
+import re
 from pydantic import BaseModel, Field
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from chains.vocabulario import REGEX_SINTOMAS, REGEX_ALARME, REGEX_DENGUE
+
 class RotaResposta(BaseModel):
     opcao: int = Field(
         description="1=Dúvidas sobre Dengue (RAG), 2=Saudações/gerais, 3=Cadastro (NOME e IDADE)"
@@ -61,4 +64,28 @@ model_classificador = ChatGoogleGenerativeAI(
     max_output_tokens=200,  
 )
 
-chain_de_roteamento = rota_prompt_template | model_classificador | parser_classifica
\ No newline at end of file
+chain_de_roteamento = rota_prompt_template | model_classificador | parser_classifica
+
+
+# Só intenção explícita de cadastro: idade ("5 anos") e "registrar" aparecem em dúvidas clínicas.
+REGEX_CADASTRO = re.compile(r"(?i)\b(cadastr\w*|meu nome|me chamo|concluir|finaliz\w*)\b")
+# Última resposta do assistente pedindo os dados do cadastro (fluxo do cadastro ou CTA do RAG).
+REGEX_PEDIDO_CADASTRO = re.compile(r"(?i)(cadastr\w*|registrar seus dados|campos faltantes|\bconcluir\b)")
+
+def _ultima_resposta(history) -> str:
+    for msg in reversed(list(history or [])):
+        if getattr(msg, "type", "") == "ai":
+            return msg.content if isinstance(msg.content, str) else ""
+    return ""
+
+def rota_local(texto: str, history=None) -> RotaResposta:
+    """Palpite de rota sem chamar o modelo (usado quando o roteamento estoura o tempo)."""
+    texto = texto or ""
+    if REGEX_SINTOMAS.search(texto) or REGEX_ALARME.search(texto) or REGEX_DENGUE.search(texto):
+        return RotaResposta(opcao=1, justificativa="palpite local: dengue")
+    if REGEX_CADASTRO.search(texto):
+        return RotaResposta(opcao=3, justificativa="palpite local: cadastro")
+    if REGEX_PEDIDO_CADASTRO.search(_ultima_resposta(history)):
+        # Ex.: "Ana, 22 anos" em resposta ao pedido de nome e idade.
+        return RotaResposta(opcao=3, justificativa="palpite local: continuação do cadastro")
+    return RotaResposta(opcao=2, justificativa="palpite local: geral")
@@ -1,14 +1,26 @@
 import os
 import re
-from operator import itemgetter
+import time
+import asyncio
+import threading
 from dotenv import load_dotenv
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableParallel, RunnableLambda
+from langchain_core.runnables import RunnableLambda
 from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 from langchain_chroma import Chroma
 
+from indices.indice_quantizado import IndiceQuantizado
+from memorias.cache_consultas import CacheConsultas, carrega_faq
+from chains.vocabulario import REGEX_SINTOMAS, REGEX_ALARME
+from chains.prazo import (
+    TIMEOUT_RECUPERACAO_S,
+    TIMEOUT_GERACAO_S,
+    HEDGE_ATRASO_S,
+    executa_etapa,
+)
+
 load_dotenv()
 
 __all__ = ["chain_orientador"]
@@ -17,34 +29,22 @@ EMBEDDING_MODEL = "models/text-embedding-004"
 DB_DIR = "db_dengue"
 COLLECTION = "dengue"
 
+# "" (padrão) usa a busca MMR do Chroma; "int8" (recomendado), "float16" (só memória)
+# ou "float32" usa o índice em memória, também com MMR.
+INDICE_QUANTIZACAO = os.getenv("INDICE_QUANTIZACAO", "").strip().lower()
+# Fator de candidatos reordenados em precisão cheia (1 = sem re-rank; ignorado em float32).
+INDICE_RERANK = int(os.getenv("INDICE_RERANK", "4"))
+# Vetores em precisão cheia para o re-rank, lidos por mmap (fora do índice carregado do Chroma).
+ORIGINAIS_PATH = os.path.join(DB_DIR, "vetores_f32.npy")
+
+# Gravado por indexa_informacao.py; quando muda, os caches de consultas são descartados.
+VERSAO_PATH = os.path.join(DB_DIR, "versao_indice.txt")
+CACHE_CONSULTAS_TAMANHO = int(os.getenv("CACHE_CONSULTAS_TAMANHO", "512"))
+# Perguntas frequentes aquecidas na inicialização (uma por linha).
+FAQ_PATH = os.getenv("FAQ_PATH", os.path.join("files", "faq.txt"))
+# Se "1", também guarda os documentos recuperados para as perguntas do FAQ (opcional).
+FAQ_PRECOMPUTA_RESULTADOS = os.getenv("FAQ_PRECOMPUTA_RESULTADOS", "0") == "1"
 
-SINTOMAS_PADRAO = [
-    r"febre(?: (?:alta|repentina))?",
-    r"dor(?:es)? de cabeça",
-    r"dor(?:es)? (?:no corpo|musculares|nas articula(?:ç|c)ões)",
-    r"mialgia",
-    r"artralgia",
-    r"dor(?:es)? (?:atr[aá]s|retro) dos olhos",
-    r"manchas (?:vermelhas|na pele)|exantema",
-    r"cansa[çc]o|fadiga|prostra[çc][aã]o",
-    r"n[áa]usea[s]?|enjoo",
-    r"v[oó]mito[s]?",
-    r"diarreia",
-    r"perda de apetite",
-]
-REGEX_SINTOMAS = re.compile(r"(?i)\b(" + r"|".join(SINTOMAS_PADRAO) + r")\b")
-
-
-SINAIS_ALARME = [
-    r"dor abdominal (?:intensa|forte) (?:e )?cont[ií]nua",
-    r"v[oó]mitos? persistentes?",
-    r"sangramento (?:nasal|gengival|vaginal|de pele)|hematomas? f[áa]ceis|pet[eé]quias",
-    r"tontura|desmaio|hipotens[aã]o|queda de press[aã]o",
-    r"letargia|irritabilidade",
-    r"hepatomegalia|f[íi]gado aumentado|dor no f[íi]gado",
-    r"hemorragi(?:a|as)|hemat[ée]mese|melena",
-]
-REGEX_ALARME = re.compile(r"(?i)\b(" + r"|".join(SINAIS_ALARME) + r")\b")
 
 def _tem_sintomas(texto: str) -> bool:
     return bool(texto and REGEX_SINTOMAS.search(texto))
@@ -91,6 +91,38 @@ def _fmt_docs(docs):
         if d and isinstance(d.page_content, str) and d.page_content.strip()
     )
 
+_STOPWORDS = {"como", "qual", "quais", "quando", "onde", "para", "pode", "posso", "sobre", "dengue", "estou", "tenho"}
+
+def _resposta_extrativa(pergunta: str, docs, max_frases: int = 5) -> str:
+    """Resposta rápida sem LLM: frases dos trechos recuperados que mais compartilham termos com a pergunta."""
+    termos = {
+        t for t in re.findall(r"\w+", (pergunta or "").lower())
+        if len(t) > 3 and t not in _STOPWORDS
+    }
+    frases = []
+    for d in docs[:3]:
+        texto = d.page_content if d and isinstance(d.page_content, str) else ""
+        for frase in re.split(r"(?<=[.!?;])\s+|\n+", texto):
+            frase = " ".join(frase.split())
+            if len(frase) >= 30:
+                frases.append(frase)
+    if not frases:
+        return (
+            "⏱️ Não consegui consultar o material a tempo. "
+            "Em caso de dúvida ou sintomas, procure uma UBS/UPA."
+        )
+
+    def _pontua(par):
+        i, frase = par
+        return (-len(termos & set(re.findall(r"\w+", frase.lower()))), i)
+
+    escolhidas = sorted(sorted(enumerate(frases), key=_pontua)[:max_frases])
+    corpo = "\n".join(f"- {frase}" for _, frase in escolhidas)
+    return (
+        "⏱️ A resposta completa está demorando. Seguem os pontos principais do material:\n\n"
+        f"{corpo}"
+    )
+
 
 rag_system = """
 Você é um assistente de saúde. Responda SOMENTE com base no contexto abaixo sobre Dengue.
@@ -132,35 +164,134 @@ try:
     _db = _chroma(_emb)
 
 
-    retriever_mmr = _db.as_retriever(
-        search_type="mmr",
-        search_kwargs={"k": 12, "fetch_k": 36}
-    )
-    retriever_bm25 = _db.as_retriever(search_kwargs={"k": 12})
+    def _monta_indice():
+        return IndiceQuantizado.de_chroma(
+            _db, modo=INDICE_QUANTIZACAO, rerank=INDICE_RERANK, caminho_originais=ORIGINAIS_PATH
+        )
+
+    _indice = _monta_indice() if INDICE_QUANTIZACAO else None
+    _cache = CacheConsultas(capacidade=CACHE_CONSULTAS_TAMANHO)
+    # Só uma reconstrução por vez; após falha, espera antes de tentar de novo.
+    _reconstrucao = threading.Lock()
+    _ultima_falha = 0.0
+    _ESPERA_APOS_FALHA_S = 60.0
+
+    def _versao_indice():
+        try:
+            with open(VERSAO_PATH, encoding="utf-8") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def _reconstroi(versao):
+        """
+        Em segundo plano: monta o novo índice e só então troca `_indice`, registra a
+        versão (limpando os caches) e reaquece o FAQ. Se falhar, mantém o índice e a
+        versão antigos, e a próxima consulta tenta de novo.
+        """
+        global _indice, _ultima_falha
+        try:
+            if INDICE_QUANTIZACAO:
+                try:
+                    novo = _monta_indice()
+                except Exception as e:
+                    _ultima_falha = time.monotonic()
+                    print(f"Falha ao reconstruir o índice; mantendo o anterior: {type(e).__name__}: {e}")
+                    return
+                _indice = novo
+            _cache.verifica_versao(versao)
+        finally:
+            _reconstrucao.release()
+        _aquece()
 
-    def _busca_contexto(pergunta: str):
-        docs = retriever_mmr.invoke(pergunta or "")
+    def _atualiza_versao() -> None:
+        """Dispara a reconstrução em segundo plano se a versão do índice mudou (não bloqueia)."""
+        versao = _versao_indice()
+        if not _cache.versao_diferente(versao):
+            return
+        if time.monotonic() - _ultima_falha < _ESPERA_APOS_FALHA_S:
+            return
+        if not _reconstrucao.acquire(blocking=False):
+            return
+        threading.Thread(target=_reconstroi, args=(versao,), daemon=True).start()
+
+    def _busca_por_vetor(vetor):
+        if _indice is not None:
+            # Mesmos k/fetch_k do MMR do Chroma; sem fallback para não carregar o índice do Chroma.
+            return _indice.busca(vetor, k=12, fetch_k=36)
+        docs = _db.max_marginal_relevance_search_by_vector(vetor, k=12, fetch_k=36)
         if not docs:
-            docs = retriever_bm25.invoke(pergunta or "")
-        return _fmt_docs(docs)
+            docs = _db.similarity_search_by_vector(vetor, k=12)
+        return docs
+
+    def _busca_docs(pergunta: str):
+        _atualiza_versao()
+        docs = _cache.resultado(pergunta or "")
+        if docs is None:
+            docs = _busca_por_vetor(_cache.embedding(pergunta or "", _emb.embed_query))
+        return docs
+
+    def aquece_cache(caminho: str = FAQ_PATH) -> int:
+        """Pré-calcula embeddings (e, opcionalmente, resultados) das perguntas do FAQ."""
+        busca = _busca_por_vetor if FAQ_PRECOMPUTA_RESULTADOS else None
+        return _cache.aquece(carrega_faq(caminho), _emb.embed_query, busca)
+
+    def _aquece():
+        try:
+            total = aquece_cache()
+            print(f"Cache de consultas aquecido: {total} perguntas do FAQ.")
+        except Exception as e:
+            print(f"Falha ao aquecer o cache de consultas: {type(e).__name__}: {e}")
+
+    # Primeira observação da versão: corresponde ao índice montado acima.
+    _cache.verifica_versao(_versao_indice())
+    threading.Thread(target=_aquece, daemon=True).start()
 
     def _append_cta(payload: dict, resposta_base: str) -> str:
         pergunta = payload.get("pergunta_usuario", "")
         extra = _cta(pergunta, resposta_base)
         return (resposta_base or "") + extra
 
-    chain_orientador = (
-        RunnableParallel({
-            "pergunta_usuario": itemgetter("pergunta_usuario"),
-            "history": itemgetter("history"),
-            "contexto_obtido": itemgetter("pergunta_usuario")
-                | RunnableLambda(_busca_contexto),
-        })
-        | prompt_template_orientador
-        | model_atendimento_orientador
-        | StrOutputParser()
-        | RunnableLambda(lambda out, **kw: _append_cta(kw.get("input", {}) if isinstance(kw, dict) else {}, out))
-    )
+    chain_geracao = prompt_template_orientador | model_atendimento_orientador | StrOutputParser()
+
+    def _entrada_geracao(payload: dict, docs) -> dict:
+        return {
+            "pergunta_usuario": payload.get("pergunta_usuario", ""),
+            "history": payload.get("history", []),
+            "contexto_obtido": _fmt_docs(docs),
+        }
+
+    def _orienta(payload: dict) -> str:
+        docs = _busca_docs(payload.get("pergunta_usuario", ""))
+        resposta = chain_geracao.invoke(_entrada_geracao(payload, docs))
+        return _append_cta(payload, resposta)
+
+    async def _aorienta(payload: dict) -> str:
+        """Versão assíncrona com timeout por etapa, limitada pelo `prazo` do payload."""
+        pergunta = payload.get("pergunta_usuario", "")
+        prazo = payload.get("prazo")
+
+        try:
+            docs = await executa_etapa(
+                lambda: asyncio.to_thread(_busca_docs, pergunta), TIMEOUT_RECUPERACAO_S, prazo
+            )
+        except asyncio.TimeoutError:
+            docs = []
+
+        if not docs:
+            # Sem contexto o prompt só diria "não encontrei no material": resposta degradada direto.
+            return _append_cta(payload, _resposta_extrativa(pergunta, docs))
+
+        entrada = _entrada_geracao(payload, docs)
+        try:
+            resposta = await executa_etapa(
+                lambda: chain_geracao.ainvoke(entrada), TIMEOUT_GERACAO_S, prazo, HEDGE_ATRASO_S
+            )
+        except asyncio.TimeoutError:
+            resposta = _resposta_extrativa(pergunta, docs)
+        return _append_cta(payload, resposta)
+
+    chain_orientador = RunnableLambda(_orienta, afunc=_aorienta)
 
 except Exception as e:
     def _erro(_):
@@ -1,18 +1,20 @@
 import os
 import csv
 import re
+import asyncio
 from typing import Optional
-from operator import itemgetter
 from dotenv import load_dotenv
 
 from pydantic import BaseModel, Field, field_validator
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnableLambda, RunnableParallel
+from langchain_core.runnables import RunnableLambda
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from chains.prazo import TIMEOUT_GERACAO_S, HEDGE_ATRASO_S, executa_etapa
+
 load_dotenv()
 
 
@@ -156,15 +158,59 @@ def processa_cadastro(cad: CadastroPessoa) -> str:
         "Por favor, informe os campos faltantes. Quando terminar, digite **concluir**."
     )
 
-chain_de_cadastro = (
-    RunnableParallel({
-        
-        "acao_executada": cadastro_prompt | model_extracao | RunnableLambda(processa_cadastro),
-        "history": itemgetter("history"),
-        "pergunta_usuario": itemgetter("pergunta_usuario"),
-    })
-    
-    | chat_prompt_final
-    | model_final
-    | StrOutputParser()
-)
+def resposta_cadastro_fixa(acao_executada: str) -> str:
+    """Resposta sem LLM a partir do resultado do processa_cadastro (usada quando a redação final atrasa)."""
+    campos = dict(re.findall(r"^(Nome|Idade|Campos faltantes): (.*)$", acao_executada or "", flags=re.M))
+    if (acao_executada or "").startswith("CADASTRO_OK"):
+        return f"✅ Cadastro registrado: {campos.get('Nome', '-')}, {campos.get('Idade', '-')} anos."
+    faltantes = campos.get("Campos faltantes", "nome, idade")
+    return f"Para concluir o cadastro, informe: **{faltantes}**. Quando terminar, digite **concluir**."
+
+
+chain_extracao_cadastro = cadastro_prompt | model_extracao
+
+chain_resposta_cadastro = chat_prompt_final | model_final | StrOutputParser()
+
+
+def _entrada_final(payload: dict, acao_executada: str) -> dict:
+    return {
+        "acao_executada": acao_executada,
+        "history": payload.get("history", []),
+        "pergunta_usuario": payload.get("pergunta_usuario", ""),
+    }
+
+
+def _cadastra(payload: dict) -> str:
+    cad = chain_extracao_cadastro.invoke(payload)
+    acao = processa_cadastro(cad)
+    return chain_resposta_cadastro.invoke(_entrada_final(payload, acao))
+
+
+async def _acadastra(payload: dict) -> str:
+    """
+    Versão assíncrona limitada pelo `prazo` do payload. Só a extração (antes de gravar
+    o CSV) pode esgotar o tempo com pedido de reenvio; depois de gravado, um atraso na
+    redação final vira uma resposta fixa, para o usuário não duplicar o cadastro.
+    """
+    prazo = payload.get("prazo")
+    try:
+        cad = await executa_etapa(
+            lambda: chain_extracao_cadastro.ainvoke(payload), TIMEOUT_GERACAO_S, prazo, HEDGE_ATRASO_S
+        )
+    except asyncio.TimeoutError:
+        return (
+            "⏱️ Não consegui processar seu cadastro a tempo e **nada foi registrado**. "
+            "Envie novamente seu **nome** e **idade**."
+        )
+
+    acao = processa_cadastro(cad)
+    try:
+        return await executa_etapa(
+            lambda: chain_resposta_cadastro.ainvoke(_entrada_final(payload, acao)),
+            TIMEOUT_GERACAO_S, prazo, HEDGE_ATRASO_S,
+        )
+    except asyncio.TimeoutError:
+        return resposta_cadastro_fixa(acao)
+
+
+chain_de_cadastro = RunnableLambda(_cadastra, afunc=_acadastra)
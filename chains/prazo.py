@@ -0,0 +1,73 @@
+import os
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+__all__ = [
+    "ORCAMENTO_TOTAL_S",
+    "TIMEOUT_ROTEAMENTO_S",
+    "TIMEOUT_RECUPERACAO_S",
+    "TIMEOUT_GERACAO_S",
+    "HEDGE_ATRASO_S",
+    "novo_prazo",
+    "restante",
+    "executa_etapa",
+]
+
+# Orçamento de latência por mensagem e limite de cada etapa (segundos).
+ORCAMENTO_TOTAL_S = float(os.getenv("ORCAMENTO_TOTAL_S", "20"))
+TIMEOUT_ROTEAMENTO_S = float(os.getenv("TIMEOUT_ROTEAMENTO_S", "4"))
+TIMEOUT_RECUPERACAO_S = float(os.getenv("TIMEOUT_RECUPERACAO_S", "5"))
+TIMEOUT_GERACAO_S = float(os.getenv("TIMEOUT_GERACAO_S", "15"))
+# Se > 0, dispara uma requisição duplicada ao modelo após esse atraso e usa a primeira que responder.
+HEDGE_ATRASO_S = float(os.getenv("HEDGE_ATRASO_S", "0"))
+
+
+def novo_prazo(orcamento_s: float = ORCAMENTO_TOTAL_S) -> float:
+    """Instante (relógio monotônico) em que o orçamento da mensagem se esgota."""
+    return time.monotonic() + orcamento_s
+
+
+def restante(prazo: Optional[float]) -> float:
+    """Segundos restantes até o prazo; sem prazo, o orçamento é ilimitado."""
+    if prazo is None:
+        return float("inf")
+    return prazo - time.monotonic()
+
+
+async def _primeira_concluida(fabrica: Callable[[], Awaitable[Any]], hedge_atraso: Optional[float]):
+    tarefas = [asyncio.ensure_future(fabrica())]
+    try:
+        if hedge_atraso and hedge_atraso > 0:
+            prontas, _ = await asyncio.wait(tarefas, timeout=hedge_atraso)
+            if not prontas:
+                tarefas.append(asyncio.ensure_future(fabrica()))
+
+        pendentes, erro = set(tarefas), None
+        while pendentes:
+            prontas, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+            for tarefa in prontas:
+                if tarefa.exception() is None:
+                    return tarefa.result()
+                erro = tarefa.exception()
+        raise erro
+    finally:
+        for tarefa in tarefas:
+            tarefa.cancel()
+
+
+async def executa_etapa(
+    fabrica: Callable[[], Awaitable[Any]],
+    timeout_etapa: float,
+    prazo: Optional[float] = None,
+    hedge_atraso: Optional[float] = None,
+):
+    """
+    Executa uma etapa limitada pelo menor entre o timeout da etapa e o orçamento restante.
+    `fabrica` cria uma nova corrotina a cada chamada (necessário para o hedge).
+    Levanta asyncio.TimeoutError quando o limite é atingido.
+    """
+    limite = min(timeout_etapa, restante(prazo))
+    if limite <= 0:
+        raise asyncio.TimeoutError()
+    return await asyncio.wait_for(_primeira_concluida(fabrica, hedge_atraso), timeout=limite)
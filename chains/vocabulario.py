@@ -0,0 +1,55 @@
+import re
+
+__all__ = [
+    "SINTOMAS_PADRAO",
+    "SINAIS_ALARME",
+    "TERMOS_DENGUE",
+    "REGEX_SINTOMAS",
+    "REGEX_ALARME",
+    "REGEX_DENGUE",
+]
+
+# Vocabulário compartilhado entre o CTA do RAG e o palpite local de rota.
+
+SINTOMAS_PADRAO = [
+    r"febre(?: (?:alta|repentina))?",
+    r"dor(?:es)? de cabeça",
+    r"dor(?:es)? (?:no corpo|musculares|nas articula(?:ç|c)ões)",
+    r"mialgia",
+    r"artralgia",
+    r"dor(?:es)? (?:atr[aá]s|retro) dos olhos",
+    r"manchas (?:vermelhas|na pele)|exantema",
+    r"cansa[çc]o|fadiga|prostra[çc][aã]o",
+    r"n[áa]usea[s]?|enjoo",
+    r"v[oó]mito[s]?",
+    r"diarreia",
+    r"perda de apetite",
+]
+REGEX_SINTOMAS = re.compile(r"(?i)\b(" + r"|".join(SINTOMAS_PADRAO) + r")\b")
+
+
+SINAIS_ALARME = [
+    r"dor abdominal (?:intensa|forte) (?:e )?cont[ií]nua",
+    r"v[oó]mitos? persistentes?",
+    r"sangramento (?:nasal|gengival|vaginal|de pele)|hematomas? f[áa]ceis|pet[eé]quias",
+    r"tontura|desmaio|hipotens[aã]o|queda de press[aã]o",
+    r"letargia|irritabilidade",
+    r"hepatomegalia|f[íi]gado aumentado|dor no f[íi]gado",
+    r"hemorragi(?:a|as)|hemat[ée]mese|melena",
+]
+REGEX_ALARME = re.compile(r"(?i)\b(" + r"|".join(SINAIS_ALARME) + r")\b")
+
+
+# Temas de dúvida sobre dengue que não são sintomas (transmissão, prevenção, medicação...).
+TERMOS_DENGUE = [
+    r"dengue",
+    r"sintomas?|sinais? de alarme",
+    r"mosquito|aedes(?: aegypti)?|criadouros?|focos?",
+    r"preven\w*|vacina\w*|repelente",
+    r"tratamento|hidrata\w*|soro",
+    r"rem[eé]dios?|medica\w*|dipirona|paracetamol|ibuprofeno|aspirina|anti-?inflamat[oó]rios?",
+    r"plaquetas?|exames?",
+    r"manchas?|dor(?:es)?|sangramentos?",
+    r"ubs|upa|posto de sa[uú]de",
+]
+REGEX_DENGUE = re.compile(r"(?i)\b(" + r"|".join(TERMOS_DENGUE) + r")\b")
@@ -1,5 +1,6 @@
 # RAG_Dengue/indexa_informacao.py
 import os
+import time
 from dotenv import load_dotenv
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -15,6 +16,8 @@ load_dotenv()
 PDF_PATH = "files/DENGUE.PDF"   # caminho fixo do PDF
 DB_DIR = "db_dengue"
 COLLECTION = "dengue"
+# Alterado a cada indexação; invalida os caches de consultas do RAG.
+VERSAO_PATH = os.path.join(DB_DIR, "versao_indice.txt")
 
 EMBEDDING_MODEL = "models/text-embedding-004"
 
@@ -67,9 +70,17 @@ def salvar_no_chroma(docs, embeddings):
     )
 
     db.add_documents(docs)
+    registrar_versao()
     print(f"✅ Indexação concluída. Chunks: {len(docs)} | DB: {DB_DIR}")
 
 
+def registrar_versao():
+    """Grava uma nova versão do índice para invalidar caches de consultas."""
+    os.makedirs(DB_DIR, exist_ok=True)
+    with open(VERSAO_PATH, "w", encoding="utf-8") as f:
+        f.write(str(time.time_ns()))
+
+
 # ------------------------------
 # Execução principal
 # ------------------------------
@@ -0,0 +1,196 @@
+# RAG_Dengue/indices/indice_quantizado.py
+import os
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+
+__all__ = ["IndiceQuantizado", "MODOS"]
+
+MODOS = ("float32", "float16", "int8")
+_BLOCO = 4096
+
+
+def _normaliza(matriz: np.ndarray) -> np.ndarray:
+    """Normaliza as linhas (norma L2) para que o produto interno seja o cosseno."""
+    normas = np.linalg.norm(matriz, axis=-1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return matriz / normas
+
+
+def _mmr(sims_consulta: np.ndarray, vetores: np.ndarray, k: int, lambda_mult: float) -> List[int]:
+    """Maximal Marginal Relevance sobre vetores normalizados (mesmo critério do Chroma/LangChain)."""
+    selecionados = [int(np.argmax(sims_consulta))]
+    max_sim_selecionados = vetores @ vetores[selecionados[0]]
+    while len(selecionados) < min(k, len(vetores)):
+        pontuacao = lambda_mult * sims_consulta - (1 - lambda_mult) * max_sim_selecionados
+        pontuacao[selecionados] = -np.inf
+        escolhido = int(np.argmax(pontuacao))
+        selecionados.append(escolhido)
+        max_sim_selecionados = np.maximum(max_sim_selecionados, vetores @ vetores[escolhido])
+    return selecionados
+
+
+def _grava_originais(caminho: str, base: np.ndarray) -> np.ndarray:
+    """
+    Grava os vetores em precisão cheia num .npy e o reabre mapeado em memória (somente leitura).
+    A escrita vai para um arquivo temporário substituído no fim, para não afetar um índice
+    anterior que ainda esteja lendo o mesmo caminho.
+    """
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as f:
+        np.save(f, base)
+    os.replace(temporario, caminho)
+    return np.load(caminho, mmap_mode="r")
+
+
+class IndiceQuantizado:
+    """
+    Índice vetorial em memória com armazenamento quantizado dos embeddings.
+
+    - float32: cópia em precisão cheia (baseline).
+    - int8: quantização escalar simétrica com escala por dimensão (1 byte por dimensão).
+      É o modo recomendado: 4x menos memória, latência pouco acima do float32.
+    - float16: meia precisão (2 bytes por dimensão). Apenas economia de memória: a
+      conversão para float32 a cada consulta deixa a busca bem mais lenta que o float32.
+
+    A busca pré-seleciona `fetch_k * rerank` candidatos no espaço quantizado. Com
+    `rerank > 1` e `caminho_originais`, eles são pontuados com os vetores em precisão
+    cheia lidos de um arquivo mapeado em memória (fora do Chroma); sem isso, com os
+    vetores desquantizados. Os `fetch_k` melhores passam por MMR, como no retriever padrão.
+    """
+
+    def __init__(
+        self,
+        vetores,
+        documentos: Sequence[Document],
+        modo: str = "int8",
+        caminho_originais: Optional[str] = None,
+        rerank: int = 1,
+    ):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de quantização inválido: {modo!r}. Use um de {MODOS}.")
+        self.modo = modo
+        self.documentos = list(documentos)
+        # Em float32 os vetores já estão em precisão cheia: re-rank não muda nada.
+        self.rerank = 1 if modo == "float32" else max(1, int(rerank))
+        self._originais = None
+        self._escala = None
+
+        if not self.documentos:
+            # Coleção vazia: a busca apenas não retorna documentos.
+            self._dados = np.empty((0, 0), dtype=np.float32)
+            return
+
+        base = _normaliza(np.asarray(vetores, dtype=np.float32))
+        if base.ndim != 2 or len(base) != len(self.documentos):
+            raise ValueError("Vetores e documentos devem ter o mesmo número de linhas.")
+
+        if self.rerank > 1 and caminho_originais:
+            self._originais = _grava_originais(caminho_originais, base)
+
+        if modo == "float32":
+            self._dados = base
+        elif modo == "float16":
+            self._dados = base.astype(np.float16)
+        else:
+            escala = np.abs(base).max(axis=0) / 127.0
+            escala[escala == 0] = 1.0
+            self._escala = escala.astype(np.float32)
+            self._dados = np.clip(np.rint(base / self._escala), -127, 127).astype(np.int8)
+
+    @classmethod
+    def de_chroma(
+        cls,
+        db,
+        modo: str = "int8",
+        rerank: int = 1,
+        caminho_originais: Optional[str] = None,
+    ) -> "IndiceQuantizado":
+        """
+        Monta o índice a partir de uma coleção Chroma já persistida. O Chroma só é lido
+        aqui; as consultas usam apenas a matriz quantizada e o arquivo de originais.
+        """
+        dados = db.get(include=["embeddings", "documents", "metadatas"])
+        ids = list(dados["ids"])
+        metadatas = dados.get("metadatas") or [None] * len(ids)
+        documentos = [
+            Document(page_content=texto or "", metadata=meta or {})
+            for texto, meta in zip(dados.get("documents") or [], metadatas)
+        ]
+        return cls(
+            dados.get("embeddings"), documentos,
+            modo=modo, caminho_originais=caminho_originais, rerank=rerank,
+        )
+
+    def __len__(self) -> int:
+        return len(self.documentos)
+
+    @property
+    def bytes_por_vetor(self) -> int:
+        """Memória da matriz quantizada por vetor (a escala int8 é compartilhada)."""
+        return self._dados.shape[1] * self._dados.itemsize
+
+    @property
+    def bytes_total(self) -> int:
+        extra = self._escala.nbytes if self._escala is not None else 0
+        return self._dados.nbytes + extra
+
+    def _scores(self, consulta: np.ndarray) -> np.ndarray:
+        if self.modo == "float32":
+            return self._dados @ consulta
+        if self.modo == "int8":
+            # <q * s, c> == <q, s * c>: aplica a escala na consulta, não na matriz.
+            consulta = consulta * self._escala
+        # Converte em blocos para float32 e usa o BLAS, sem materializar a matriz inteira.
+        scores = np.empty(len(self._dados), dtype=np.float32)
+        for ini in range(0, len(self._dados), _BLOCO):
+            bloco = self._dados[ini:ini + _BLOCO].astype(np.float32)
+            scores[ini:ini + _BLOCO] = bloco @ consulta
+        return scores
+
+    def _vetores_candidatos(self, posicoes: np.ndarray) -> np.ndarray:
+        if self._originais is not None:
+            # Lê do arquivo mapeado só as linhas dos candidatos.
+            return np.asarray(self._originais[posicoes], dtype=np.float32)
+        vetores = self._dados[posicoes].astype(np.float32)
+        if self._escala is not None:
+            vetores *= self._escala
+        return _normaliza(vetores)
+
+    def busca_posicoes(
+        self,
+        embedding,
+        k: int = 12,
+        fetch_k: int = 36,
+        lambda_mult: float = 0.5,
+        mmr: bool = True,
+    ) -> List[int]:
+        """Posições dos k vetores escolhidos (MMR sobre os candidatos, ou só cosseno com mmr=False)."""
+        n = len(self)
+        if n == 0 or k <= 0:
+            return []
+        consulta = _normaliza(np.asarray(embedding, dtype=np.float32))
+        k = min(k, n)
+        reserva = min(n, max(k, fetch_k) if mmr else k)
+        # O re-rank amplia a pré-seleção quantizada; depois do re-score exato ficam só os
+        # `reserva` melhores, para o MMR ver o mesmo conjunto que veria em float32.
+        candidatos = min(n, reserva * self.rerank)
+
+        scores = self._scores(consulta)
+        topo = np.argpartition(-scores, candidatos - 1)[:candidatos]
+
+        vetores = self._vetores_candidatos(topo)
+        sims = vetores @ consulta
+        if candidatos > reserva:
+            melhores = np.argpartition(-sims, reserva - 1)[:reserva]
+            topo, vetores, sims = topo[melhores], vetores[melhores], sims[melhores]
+        if mmr:
+            escolhidos = _mmr(sims, vetores, k, lambda_mult)
+        else:
+            escolhidos = np.argsort(-sims)[:k]
+        return topo[escolhidos].tolist()
+
+    def busca(self, embedding, k: int = 12, fetch_k: int = 36, mmr: bool = True) -> List[Document]:
+        return [self.documentos[p] for p in self.busca_posicoes(embedding, k, fetch_k, mmr=mmr)]
@@ -16,10 +16,22 @@ from langchain_core.runnables import RunnableLambda, RunnableParallel, RunnableP
 from langchain_core.runnables.history import RunnableWithMessageHistory
 
 from memorias.memoria import get_session_history, trimmer
-from chains.chain_classifica import chain_de_roteamento
+from chains.chain_classifica import chain_de_roteamento, rota_local
 from chains.chain_rag_duvidas import chain_orientador
 from chains.chain_geral import chain_temas_nao_relacionados
 from chains.chain_registro_ocorrencia import chain_de_cadastro
+from chains.prazo import (
+    TIMEOUT_ROTEAMENTO_S,
+    TIMEOUT_GERACAO_S,
+    HEDGE_ATRASO_S,
+    novo_prazo,
+    executa_etapa,
+)
+
+MENSAGEM_TEMPO_ESGOTADO = (
+    "⏱️ A resposta está demorando mais do que o esperado. "
+    "Tente novamente em alguns instantes."
+)
 
 
 async def simulate_streaming(text: str, message: cl.Message, chunk_size: int = 3) -> None:
@@ -46,29 +58,50 @@ async def simulate_streaming(text: str, message: cl.Message, chunk_size: int = 3
             
             await asyncio.sleep(0.02)
 
-def _escolhe_rota(entrada: dict):
+async def _roteia(entrada: dict):
+    """Roteamento pelo modelo; se estourar o tempo, usa o palpite local."""
+    try:
+        return await executa_etapa(
+            lambda: chain_de_roteamento.ainvoke({"input": entrada["input"], "history": entrada["history"]}),
+            TIMEOUT_ROTEAMENTO_S,
+            entrada.get("prazo"),
+            HEDGE_ATRASO_S,
+        )
+    except asyncio.TimeoutError:
+        print("Roteamento excedeu o tempo; usando palpite local.")
+        return rota_local(entrada["input"], entrada["history"])
+
+async def _executa_rota(entrada: dict):
     opcao = entrada["resposta_pydantic"].opcao
+    payload = {
+        "pergunta_usuario": entrada["input"],
+        "history": entrada["history"],
+        "prazo": entrada.get("prazo"),
+    }
     if opcao == 1:
-        rota = chain_orientador                 
-    elif opcao == 2:
-        rota = chain_temas_nao_relacionados     
-    elif opcao == 3:
-        rota = chain_de_cadastro                
-    else:
-        rota = chain_temas_nao_relacionados
-
-    return RunnableLambda(lambda x: {
-        "pergunta_usuario": x["input"],
-        "history": x["history"],
-    }) | rota
+        # O RAG aplica os próprios timeouts (recuperação e geração) e tem resposta degradada.
+        return await chain_orientador.ainvoke(payload)
+
+    if opcao == 3:
+        # O cadastro limita extração e redação final separadamente: depois de gravar o CSV,
+        # um atraso vira resposta fixa em vez de pedido de reenvio (evita linha duplicada).
+        return await chain_de_cadastro.ainvoke(payload)
+
+    try:
+        return await executa_etapa(
+            lambda: chain_temas_nao_relacionados.ainvoke(payload), TIMEOUT_GERACAO_S, payload["prazo"]
+        )
+    except asyncio.TimeoutError:
+        return MENSAGEM_TEMPO_ESGOTADO
 
 chain_principal = (
     RunnableParallel({
         "input": itemgetter("input"),
         "history": itemgetter("history"),
-        "resposta_pydantic": chain_de_roteamento
+        "prazo": lambda x: x.get("prazo"),
+        "resposta_pydantic": RunnableLambda(_roteia),
     })
-    | RunnableLambda(_escolhe_rota)
+    | RunnableLambda(_executa_rota)
 )
 
 chain_principal_com_trimming = (
@@ -110,7 +143,7 @@ async def on_message(message: cl.Message):
         
         
         resp = await runnable_with_history.ainvoke(
-            {"input": user_input, "history": []},
+            {"input": user_input, "history": [], "prazo": novo_prazo()},
             config={"configurable": {"session_id": session_id}}
         )
         
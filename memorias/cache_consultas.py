@@ -0,0 +1,154 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+__all__ = ["CacheConsultas", "normaliza_consulta", "carrega_faq"]
+
+# Distingue "versão ainda não observada" de "índice sem arquivo de versão" (None).
+_NAO_OBSERVADA = object()
+
+
+def normaliza_consulta(texto: str) -> str:
+    """Chave do cache: minúsculas, sem acentos, pontuação final e espaços extras."""
+    texto = unicodedata.normalize("NFKD", (texto or "").lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r"\s+", " ", texto).strip()
+    return texto.rstrip(" ?!.")
+
+
+def carrega_faq(caminho: str) -> List[str]:
+    """Uma pergunta por linha; linhas vazias e iniciadas por '#' são ignoradas."""
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            return [l.strip() for l in f if l.strip() and not l.lstrip().startswith("#")]
+    except FileNotFoundError:
+        return []
+
+
+class CacheConsultas:
+    """
+    Cache em memória da etapa de recuperação:
+    - LRU de consulta normalizada → embedding (evita a chamada à API de embeddings);
+    - resultados pré-computados (documentos) das perguntas do FAQ.
+
+    Os dois são invalidados juntos quando a versão do índice muda.
+    """
+
+    def __init__(self, capacidade: int = 512):
+        self.capacidade = capacidade
+        self._embeddings: "OrderedDict[str, list]" = OrderedDict()
+        self._resultados: Dict[str, list] = {}
+        self._versao = _NAO_OBSERVADA
+        # Incrementado a cada invalidação; permite descartar aquecimentos em andamento.
+        self._geracao = 0
+        self._lock = threading.Lock()
+        self.hits_embedding = 0
+        self.misses_embedding = 0
+        self.hits_resultado = 0
+
+    def verifica_versao(self, versao: Optional[str]) -> bool:
+        """
+        Limpa os caches se a versão do índice mudou desde a última observação
+        (inclusive de/para None). Retorna True se limpou.
+        """
+        with self._lock:
+            if self._versao is _NAO_OBSERVADA:
+                self._versao = versao
+                return False
+            if versao == self._versao:
+                return False
+            self._versao = versao
+            self._geracao += 1
+            self._embeddings.clear()
+            self._resultados.clear()
+            return True
+
+    def versao_diferente(self, versao: Optional[str]) -> bool:
+        """True se `versao` difere da última observada, sem alterar os caches."""
+        with self._lock:
+            return self._versao is not _NAO_OBSERVADA and versao != self._versao
+
+    def embedding(self, texto: str, calcula: Callable[[str], list]) -> list:
+        chave = normaliza_consulta(texto)
+        with self._lock:
+            vetor = self._embeddings.get(chave)
+            if vetor is not None:
+                self._embeddings.move_to_end(chave)
+                self.hits_embedding += 1
+                return vetor
+            self.misses_embedding += 1
+        # A chamada à API fica fora do lock.
+        vetor = calcula(texto)
+        self.guarda_embedding(texto, vetor)
+        return vetor
+
+    def guarda_embedding(self, texto: str, vetor: list) -> None:
+        with self._lock:
+            self._guarda_embedding(normaliza_consulta(texto), vetor)
+
+    def _guarda_embedding(self, chave: str, vetor: list) -> None:
+        # Chamar com o lock adquirido.
+        self._embeddings[chave] = vetor
+        self._embeddings.move_to_end(chave)
+        while len(self._embeddings) > self.capacidade:
+            self._embeddings.popitem(last=False)
+
+    def resultado(self, texto: str) -> Optional[list]:
+        with self._lock:
+            docs = self._resultados.get(normaliza_consulta(texto))
+            if docs is not None:
+                self.hits_resultado += 1
+            return docs
+
+    def guarda_resultado(self, texto: str, docs: list) -> None:
+        with self._lock:
+            self._resultados[normaliza_consulta(texto)] = docs
+
+    def aquece(
+        self,
+        perguntas: Iterable[str],
+        calcula: Callable[[str], list],
+        busca: Optional[Callable[[list], list]] = None,
+    ) -> int:
+        """
+        Pré-calcula os embeddings das perguntas (e, com `busca`, os documentos recuperados).
+        Retorna quantas perguntas foram aquecidas. Se a versão do índice mudar durante
+        o aquecimento, para sem gravar nada calculado a partir do índice antigo.
+        """
+        with self._lock:
+            geracao = self._geracao
+        total = 0
+        for pergunta in perguntas:
+            chave = normaliza_consulta(pergunta)
+            # Não conta nas estatísticas de hit/miss: o aquecimento não é tráfego real.
+            with self._lock:
+                vetor = self._embeddings.get(chave)
+            if vetor is None:
+                vetor = calcula(pergunta)
+            docs = busca(vetor) if busca is not None else None
+            with self._lock:
+                if self._geracao != geracao:
+                    break
+                self._guarda_embedding(chave, vetor)
+                if docs is not None:
+                    self._resultados[chave] = docs
+            total += 1
+        return total
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            consultas = self.hits_embedding + self.misses_embedding
+            total = consultas + self.hits_resultado
+            return {
+                "versao": None if self._versao is _NAO_OBSERVADA else self._versao,
+                "embeddings": len(self._embeddings),
+                "resultados": len(self._resultados),
+                "hits_embedding": self.hits_embedding,
+                "misses_embedding": self.misses_embedding,
+                "taxa_hit_embedding": self.hits_embedding / consultas if consultas else 0.0,
+                "hits_resultado": self.hits_resultado,
+                # Consultas atendidas sem chamar a API de embeddings (LRU ou resultado pré-computado).
+                "taxa_hit_total": (self.hits_embedding + self.hits_resultado) / total if total else 0.0,
+            }